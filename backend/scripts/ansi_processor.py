@@ -8,34 +8,94 @@ after applying all cursor movements, clear operations, and text positioning comm
 
 import re
 import sys
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# ANSI escape sequences: CSI (including private "?" modes) and character set selection
+_ANSI_RE = re.compile(r'\x1b\[[?]?[0-9;]*[a-zA-Z]|\x1b\([AB0]')
+
+# A proper prefix of an escape sequence; when the content ends in one of these the
+# sequence may still be completed by the next chunk
+_ANSI_PARTIAL_RE = re.compile(r'\x1b(?:\[[?]?[0-9;]*|\()?')
+
+# Longest partial sequence held back between chunks; anything longer is treated as
+# unrecognised so a runaway "ESC[123..." cannot grow the pending buffer without bound
+_MAX_PENDING_ESCAPE = 256
+
+# Parameter strings of erase-in-line sequences handled without dispatch
+_ERASE_LINE_MODES = {'': 0, '0': 0, '1': 1, '2': 2}
+
+# Input is read this many characters at a time, so peak memory follows the screen buffer
+# (rows written x widest row) rather than the size of the log
+_CHUNK_SIZE = 1 << 20
+
+# C0 control characters; everything else is written to the screen as-is
+_CTRL_RE = re.compile(r'[\x00-\x1f]')
+
+# Screen cells are single bytes; non-ASCII characters are stored out of band and
+# marked with a NUL byte, which can never be written directly (control characters are dropped)
+_UNICODE_CELL = 0x00
+
+def _parse_one(param: str, default: int = 1) -> int:
+    """Parse a single numeric CSI parameter, using the default when it is omitted"""
+    return int(param) if param else default
 
 class ANSIProcessor:
     def __init__(self):
-        self.screen: List[List[str]] = []
         self.cursor_row = 0
         self.cursor_col = 0
-        self.max_cols = 200  # Reasonable terminal width
+        self._pending = ''  # Incomplete escape sequence carried over from the previous chunk
+        self._reset_buffer()
+    
+    def _reset_buffer(self):
+        """Allocate an empty screen buffer at the initial size"""
+        self.max_cols = 200  # Reasonable terminal width; also the row stride of buf
         self.max_rows = 100  # Start with reasonable height
-        
+        # Single flat buffer of max_rows * max_cols cells, row-major
+        self.buf = bytearray(b' ' * (self.max_rows * self.max_cols))
+        self.row_count = 0  # High-water mark of rows that have been written
+        self.unicode_cells: Dict[Tuple[int, int], str] = {}
+    
+    def _grow(self, new_rows: int, new_cols: int):
+        """Reallocate the buffer with a new shape, copying existing rows.
+
+        Changing the stride re-lays out rows, so callers size new_rows from the rows
+        actually written; spare row capacity is added later by same-stride extends.
+        """
+        old_cols = self.max_cols
+        if new_cols == old_cols:
+            # Same stride: rows can simply be appended
+            self.buf.extend(b' ' * ((new_rows - self.max_rows) * old_cols))
+        else:
+            new = bytearray(b' ' * (new_rows * new_cols))
+            for r in range(min(self.row_count, new_rows)):
+                new[r * new_cols:r * new_cols + old_cols] = self.buf[r * old_cols:(r + 1) * old_cols]
+            self.buf = new
+            self.max_cols = new_cols
+        self.max_rows = new_rows
+    
+    def row_view(self, row: int) -> memoryview:
+        """Writable view of a single screen row; release it before the buffer can grow"""
+        return memoryview(self.buf)[row * self.max_cols:(row + 1) * self.max_cols]
+    
     def ensure_screen_size(self, row: int, col: int):
-        """Ensure screen buffer is large enough for the given position"""
-        # Extend rows if needed
-        while len(self.screen) <= row:
-            self.screen.append([' '] * self.max_cols)
-        
-        # Extend columns in existing rows if needed
+        """Ensure screen buffer is large enough to write the given cell.
+
+        Only writes call this; cursor movement alone never allocates, so jumping far
+        down or right costs nothing until text actually lands there. Both dimensions
+        grow geometrically to keep reallocation amortized.
+        """
         if col >= self.max_cols:
-            new_cols = col + 50  # Add some buffer
-            for screen_row in self.screen:
-                screen_row.extend([' '] * (new_cols - len(screen_row)))
-            self.max_cols = new_cols
+            # Only re-lay out rows that hold data; unwritten rows cost nothing
+            self._grow(max(self.row_count, row + 1), max(col + 1, self.max_cols * 2))
+        if row >= self.max_rows:
+            self._grow(max(row + 1, self.max_rows * 2), self.max_cols)
+        if row >= self.row_count:
+            self.row_count = row + 1
     
     def set_cursor(self, row: int, col: int):
-        """Set cursor position, ensuring screen is large enough"""
+        """Set cursor position"""
         self.cursor_row = max(0, row)
         self.cursor_col = max(0, col)
-        self.ensure_screen_size(self.cursor_row, self.cursor_col)
     
     def move_cursor_up(self, lines: int = 1):
         """Move cursor up by specified lines"""
@@ -44,168 +104,219 @@ class ANSIProcessor:
     def move_cursor_down(self, lines: int = 1):
         """Move cursor down by specified lines"""
         self.cursor_row += lines
-        self.ensure_screen_size(self.cursor_row, self.cursor_col)
     
     def move_cursor_forward(self, cols: int = 1):
         """Move cursor forward by specified columns"""
         self.cursor_col += cols
-        self.ensure_screen_size(self.cursor_row, self.cursor_col)
     
     def move_cursor_backward(self, cols: int = 1):
         """Move cursor backward by specified columns"""
         self.cursor_col = max(0, self.cursor_col - cols)
     
+    def move_cursor_to_column(self, col: int = 1):
+        """Move cursor to the given 1-based column"""
+        self.cursor_col = max(0, col - 1)  # Convert to 0-based
+    
     def clear_line(self, mode: int = 0):
         """Clear line based on mode: 0=cursor to end, 1=start to cursor, 2=entire line"""
-        if self.cursor_row < len(self.screen):
-            row = self.screen[self.cursor_row]
-            if mode == 0:  # Clear from cursor to end of line
-                for i in range(self.cursor_col, len(row)):
-                    row[i] = ' '
-            elif mode == 1:  # Clear from start of line to cursor
-                for i in range(0, min(self.cursor_col + 1, len(row))):
-                    row[i] = ' '
-            elif mode == 2:  # Clear entire line
-                for i in range(len(row)):
-                    row[i] = ' '
+        if self.cursor_row < self.row_count:
+            with self.row_view(self.cursor_row) as row:
+                if mode == 0:  # Clear from cursor to end of line
+                    row[self.cursor_col:] = b' ' * max(0, len(row) - self.cursor_col)
+                elif mode == 1:  # Clear from start of line to cursor
+                    end = min(self.cursor_col + 1, len(row))
+                    row[:end] = b' ' * end
+                elif mode == 2:  # Clear entire line
+                    row[:] = b' ' * len(row)
     
     def clear_screen(self, mode: int = 0):
         """Clear screen based on mode: 0=cursor to end, 1=start to cursor, 2=entire screen"""
         if mode == 2:  # Clear entire screen
-            self.screen = []
+            # Blank the rows written so far in place (rows past the high-water mark are
+            # already blank) and keep the allocation for the output that follows
+            used = self.row_count * self.max_cols
+            self.buf[:used] = b' ' * used
+            self.row_count = 0
+            self.unicode_cells.clear()
             self.cursor_row = 0
             self.cursor_col = 0
         # Note: Other modes would require more complex implementation
     
-    def insert_text(self, text: str):
-        """Insert text at current cursor position"""
-        for char in text:
+    def insert_text(self, text: str, start: int = 0, end: Optional[int] = None):
+        """Insert text[start:end] at current cursor position without copying the range first"""
+        if end is None:
+            end = len(text)
+        # Track the cursor and buffer shape in locals and write the cursor back once at the end.
+        # ASCII runs that fit in an already-written row are copied inline; anything that
+        # needs the buffer to grow or carries non-ASCII characters goes through _insert_plain.
+        row, col = self.cursor_row, self.cursor_col
+        buf, stride, row_count = self.buf, self.max_cols, self.row_count
+        pos = start
+        while pos < end:
+            match = _CTRL_RE.search(text, pos, end)
+            ctrl = match.start() if match else end
+            if ctrl > pos:
+                run = text[pos:ctrl]
+                end_col = col + ctrl - pos
+                if row < row_count and end_col <= stride and run.isascii():
+                    base = row * stride
+                    buf[base + col:base + end_col] = run.encode('ascii')
+                    col = end_col
+                else:
+                    col = self._insert_plain(row, col, run)
+                    buf, stride, row_count = self.buf, self.max_cols, self.row_count
+            if match is None:
+                break
+            pos = ctrl + 1
+            
+            char = text[ctrl]
             if char == '\n':
-                self.cursor_row += 1
-                self.cursor_col = 0
-                self.ensure_screen_size(self.cursor_row, self.cursor_col)
+                row += 1
+                col = 0
             elif char == '\r':
-                self.cursor_col = 0
+                col = 0
             elif char == '\t':
                 # Move to next tab stop (8-character boundaries)
-                self.cursor_col = ((self.cursor_col // 8) + 1) * 8
-                self.ensure_screen_size(self.cursor_row, self.cursor_col)
-            elif ord(char) >= 32:  # Printable character
-                self.ensure_screen_size(self.cursor_row, self.cursor_col)
-                self.screen[self.cursor_row][self.cursor_col] = char
-                self.cursor_col += 1
+                col = ((col // 8) + 1) * 8
+            # Other control characters are dropped
+        
+        self.cursor_row, self.cursor_col = row, col
+    
+    def _insert_plain(self, row: int, col: int, text: str) -> int:
+        """Write a run of printable characters at (row, col), growing the buffer as needed.
+
+        Returns the column just past the written run.
+        """
+        end_col = col + len(text)
+        self.ensure_screen_size(row, end_col - 1)
+        base = row * self.max_cols
+        if text.isascii():
+            self.buf[base + col:base + end_col] = text.encode('ascii')
+        else:
+            cells = bytearray(text.encode('ascii', 'replace'))
+            unicode_cells = self.unicode_cells
+            for offset, char in enumerate(text):
+                if ord(char) > 0x7f:
+                    cells[offset] = _UNICODE_CELL
+                    unicode_cells[(row, col + offset)] = char
+            self.buf[base + col:base + end_col] = cells
+        return end_col
+    
+    def _csi_cursor_position(self, params: str):
+        """Cursor position (row;col)"""
+        # Convert to 0-based; only split when a column is actually given
+        if ';' in params:
+            parts = params.split(';', 2)
+            row = _parse_one(parts[0]) - 1
+            col = _parse_one(parts[1]) - 1
+        else:
+            row = _parse_one(params) - 1
+            col = 0
+        self.set_cursor(row, col)
     
     def process_escape_sequence(self, sequence: str):
         """Process a single ANSI escape sequence"""
         # CSI sequences (Control Sequence Introducer)
         if sequence.startswith('['):
-            csi_content = sequence[1:]
-            
-            # Cursor position (row;col)
-            if csi_content.endswith('H') or csi_content.endswith('f'):
-                params = csi_content[:-1].split(';') if csi_content[:-1] else ['1', '1']
-                row = int(params[0] if params[0] else '1') - 1  # Convert to 0-based
-                col = int(params[1] if len(params) > 1 and params[1] else '1') - 1
-                self.set_cursor(row, col)
-            
-            # Cursor up
-            elif csi_content.endswith('A'):
-                lines = int(csi_content[:-1]) if csi_content[:-1] else 1
-                self.move_cursor_up(lines)
-            
-            # Cursor down
-            elif csi_content.endswith('B'):
-                lines = int(csi_content[:-1]) if csi_content[:-1] else 1
-                self.move_cursor_down(lines)
-            
-            # Cursor forward
-            elif csi_content.endswith('C'):
-                cols = int(csi_content[:-1]) if csi_content[:-1] else 1
-                self.move_cursor_forward(cols)
-            
-            # Cursor backward
-            elif csi_content.endswith('D'):
-                cols = int(csi_content[:-1]) if csi_content[:-1] else 1
-                self.move_cursor_backward(cols)
-            
-            # Move to column (G command)
-            elif csi_content.endswith('G'):
-                col = int(csi_content[:-1]) if csi_content[:-1] else 1
-                self.cursor_col = max(0, col - 1)  # Convert to 0-based
-                self.ensure_screen_size(self.cursor_row, self.cursor_col)
-            
-            # Erase in line
-            elif csi_content.endswith('K'):
-                mode = int(csi_content[:-1]) if csi_content[:-1] else 0
-                self.clear_line(mode)
-            
-            # Erase in screen
-            elif csi_content.endswith('J'):
-                mode = int(csi_content[:-1]) if csi_content[:-1] else 0
-                self.clear_screen(mode)
-            
             # Color and styling codes (SGR) - we ignore these for final text output
-            elif csi_content.endswith('m'):
-                pass  # Ignore color/style codes
+            if sequence.endswith('m'):
+                return
+            handler = _CSI_HANDLERS.get(sequence[-1])
+            if handler:
+                handler(self, sequence[1:-1])
         
         # Handle other escape sequences as needed
         # For now, we'll ignore most other sequences
     
     def process_content(self, content: str) -> str:
         """Process the entire content and return final text"""
-        # Pattern to match ANSI escape sequences including character set sequences
-        ansi_pattern = r'\x1b\[[0-9;]*[a-zA-Z]|\x1b\[[?][0-9;]*[a-zA-Z]|\x1b\[[?][0-9]*[hl]|\x1b\([AB0]'
-        
-        i = 0
-        while i < len(content):
-            # Look for escape sequence
-            if content[i] == '\x1b' and i + 1 < len(content):
-                # Find the end of the escape sequence
-                match = re.match(ansi_pattern, content[i:])
-                if match:
-                    sequence = match.group(0)
-                    self.process_escape_sequence(sequence[1:])  # Remove the ESC character
-                    i += len(sequence)
-                    continue
-            
-            # Regular character - add to screen
-            if content[i] != '\x1b':
-                self.insert_text(content[i])
-            
-            i += 1
-        
+        return self.process_stream((content,))
+    
+    def process_stream(self, chunks: Iterable[str]) -> str:
+        """Process content delivered in chunks and return final text"""
+        for chunk in chunks:
+            self.feed(chunk)
+        return self.finish()
+    
+    def feed(self, chunk: str):
+        """Process one chunk, holding back a trailing escape sequence that is not yet complete"""
+        if self._pending:
+            chunk = self._pending + chunk
+        self._pending = self._process_chunk(chunk, final=False)
+    
+    def finish(self) -> str:
+        """Flush any held-back input and return final text"""
+        if self._pending:
+            pending, self._pending = self._pending, ''
+            self._process_chunk(pending, final=True)
         return self.get_final_text()
     
+    def _process_chunk(self, content: str, final: bool) -> str:
+        """Apply content to the screen; returns the unprocessed tail when not final"""
+        # Skip ahead to each ESC with str.find and only try the escape pattern there;
+        # an ESC that does not start a recognised sequence stays in the plain run and
+        # is dropped by insert_text
+        insert_text = self.insert_text
+        process_escape_sequence = self.process_escape_sequence
+        clear_line = self.clear_line
+        find = content.find
+        match_escape = _ANSI_RE.match
+        pos = scan = 0
+        while True:
+            esc = find('\x1b', scan)
+            if esc < 0:
+                break
+            
+            match = match_escape(content, esc)
+            if match is None:
+                if (not final and len(content) - esc <= _MAX_PENDING_ESCAPE
+                        and _ANSI_PARTIAL_RE.fullmatch(content, esc)):
+                    # The sequence may continue in the next chunk
+                    if esc > pos:
+                        insert_text(content, pos, esc)
+                    return content[esc:]
+                scan = esc + 1
+                continue
+            seq_end = match.end()
+            if esc > pos:
+                insert_text(content, pos, esc)
+            pos = scan = seq_end
+            command = content[seq_end - 1]
+            # SGR sequences are by far the most common and never affect the text,
+            # so skip them before slicing out the sequence
+            if command == 'm':
+                continue
+            # Erase in line is emitted after nearly every '\r' by progress bars;
+            # clear directly instead of going through dispatch and parameter parsing
+            if command == 'K':
+                erase_mode = _ERASE_LINE_MODES.get(content[esc + 2:seq_end - 1])
+                if erase_mode is not None:
+                    clear_line(erase_mode)
+                    continue
+            process_escape_sequence(content[esc + 1:seq_end])  # Remove the ESC character
+        if pos < len(content):
+            insert_text(content, pos)
+        return ''
+    
+    def _row_text(self, row_idx: int, row) -> str:
+        """Decode a screen row, restoring any non-ASCII cells"""
+        text = str(row, 'ascii')
+        if '\x00' not in text:
+            return text
+        return ''.join(
+            self.unicode_cells[(row_idx, col_idx)] if char == '\x00' else char
+            for col_idx, char in enumerate(text)
+        )
+    
     def get_final_text(self) -> str:
         """Get the final text output from the screen buffer"""
+        buf = self.buf
+        stride = self.max_cols
         result_lines = []
-        
-        # Find the actual content bounds
-        last_content_row = -1
-        for row_idx in range(len(self.screen)):
-            row = self.screen[row_idx]
-            # Check if row has any non-space content
-            if any(char != ' ' for char in row):
-                last_content_row = row_idx
-        
-        # Extract content up to the last meaningful row
-        for row_idx in range(last_content_row + 1):
-            if row_idx < len(self.screen):
-                row = self.screen[row_idx]
-                # Find last non-space character
-                last_char = -1
-                for col_idx in range(len(row) - 1, -1, -1):
-                    if row[col_idx] != ' ':
-                        last_char = col_idx
-                        break
-                
-                # Extract the meaningful part of the line
-                if last_char >= 0:
-                    line = ''.join(row[:last_char + 1])
-                else:
-                    line = ''
-                
-                result_lines.append(line.rstrip())
+        for row_idx in range(self.row_count):
+            # Trailing blanks are trimmed in C before anything is decoded
+            cells = buf[row_idx * stride:(row_idx + 1) * stride].rstrip(b' ')
+            result_lines.append(self._row_text(row_idx, cells).rstrip() if cells else '')
         
         # Remove trailing empty lines
         while result_lines and not result_lines[-1]:
@@ -213,6 +324,39 @@ class ANSIProcessor:
         
         return '\n'.join(result_lines)
 
+def _make_csi_handler(name: str, default: int) -> Callable[[ANSIProcessor, str], None]:
+    """Specialize a single-parameter CSI command with its method name and default baked in.
+
+    The method is looked up on the processor at call time so subclass overrides apply.
+    """
+    def handler(processor: ANSIProcessor, params: str):
+        getattr(processor, name)(int(params) if params else default)
+    return handler
+
+def _make_csi_passthrough(name: str) -> Callable[[ANSIProcessor, str], None]:
+    """Hand the raw parameter string to a method that parses it itself"""
+    def handler(processor: ANSIProcessor, params: str):
+        getattr(processor, name)(params)
+    return handler
+
+# The final byte of a CSI sequence uniquely identifies the command; each handler
+# receives the parameter string between '[' and the final byte
+_CSI_HANDLERS: Dict[str, Callable[[ANSIProcessor, str], None]] = {
+    'H': _make_csi_passthrough('_csi_cursor_position'),
+    'f': _make_csi_passthrough('_csi_cursor_position'),
+}
+for _command, (_name, _default) in {
+    'A': ('move_cursor_up', 1),
+    'B': ('move_cursor_down', 1),
+    'C': ('move_cursor_forward', 1),
+    'D': ('move_cursor_backward', 1),
+    'G': ('move_cursor_to_column', 1),
+    'K': ('clear_line', 0),
+    'J': ('clear_screen', 0),
+}.items():
+    _CSI_HANDLERS[_command] = _make_csi_handler(_name, _default)
+del _command, _name, _default
+
 def main():
     if len(sys.argv) != 3:
         print("Usage: python ansi_processor.py <input_file> <output_file>")
@@ -222,11 +366,11 @@ def main():
     output_file = sys.argv[2]
     
     try:
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-        
         processor = ANSIProcessor()
-        final_text = processor.process_content(content)
+        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                processor.feed(chunk)
+        final_text = processor.finish()
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(final_text)
@@ -0,0 +1,42 @@
+import { describe, it, expect } from 'vitest';
+import { join } from 'path';
+import { spawnSync } from 'child_process';
+
+// Feeds content to scripts/ansi_processor.py in-process and reports the screen
+// buffer size alongside the rendered text length.
+const PROBE = `
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from ansi_processor import ANSIProcessor
+content = sys.stdin.read()
+processor = ANSIProcessor()
+text = processor.process_content(content)
+print(json.dumps({'buf': len(processor.buf), 'text': len(text)}))
+`;
+
+function probe(content) {
+  const result = spawnSync(
+    'python3',
+    ['-c', PROBE, join(process.cwd(), 'scripts')],
+    { encoding: 'utf8', input: content, maxBuffer: 1 << 20 },
+  );
+  expect(result.status).toBe(0);
+  return JSON.parse(result.stdout);
+}
+
+describe('ansi_processor buffer growth', () => {
+  it('does not reserve full-width rows for a single long line', () => {
+    const lineLength = 1_000_000;
+    const { buf, text } = probe('x'.repeat(lineLength));
+    expect(text).toBe(lineLength);
+    // Column growth doubles the stride, but unwritten rows must not be allocated
+    expect(buf).toBeLessThanOrEqual(2 * lineLength);
+  });
+
+  it('only widens rows that have been written', () => {
+    const lineLength = 100_000;
+    const content = 'short\n'.repeat(9) + 'x'.repeat(lineLength);
+    const { buf } = probe(content);
+    expect(buf).toBeLessThanOrEqual(10 * 2 * lineLength);
+  });
+});
@@ -0,0 +1,66 @@
+import { describe, it, expect } from 'vitest';
+import { join } from 'path';
+import { spawnSync } from 'child_process';
+
+// For each case, renders the content unsplit with process_content and in pieces
+// with feed()/finish(), and reports both texts.
+const PROBE = `
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from ansi_processor import ANSIProcessor
+results = []
+for case in json.load(sys.stdin):
+    content, splits = case['content'], case['splits']
+    whole = ANSIProcessor().process_content(content)
+    processor = ANSIProcessor()
+    bounds = [0] + splits + [len(content)]
+    for start, end in zip(bounds, bounds[1:]):
+        processor.feed(content[start:end])
+    results.append({'whole': whole, 'streamed': processor.finish()})
+print(json.dumps(results))
+`;
+
+function probe(cases) {
+  const result = spawnSync(
+    'python3',
+    ['-c', PROBE, join(process.cwd(), 'scripts')],
+    { encoding: 'utf8', input: JSON.stringify(cases) },
+  );
+  expect(result.status).toBe(0);
+  return JSON.parse(result.stdout);
+}
+
+// Split the content at every position inside the first occurrence of `sequence`
+function splitInside(content, sequence) {
+  const start = content.indexOf(sequence);
+  const cases = [];
+  for (let offset = 1; offset <= sequence.length; offset++) {
+    cases.push({ content, splits: [start + offset] });
+  }
+  return cases;
+}
+
+describe('ansi_processor streaming', () => {
+  const samples = [
+    ['lone ESC', 'before\x1b', 'before\x1bafter\nnext line'],
+    ['CSI introducer', 'abc\x1b[', 'abc\x1b[31mred\x1b[0m plain'],
+    ['cursor position parameters', '\x1b[12;3', 'top\n\x1b[12;3Hplaced text'],
+    ['character set selection', '\x1b(', 'one\x1b(Btwo\x1b(0three'],
+    ['erase in line', '\x1b[K', 'progress 10%\r\x1b[Kprogress 20%'],
+  ];
+
+  for (const [name, sequence, content] of samples) {
+    it(`matches unsplit output when a chunk ends inside ${name}`, () => {
+      for (const { whole, streamed } of probe(splitInside(content, sequence))) {
+        expect(streamed).toBe(whole);
+      }
+    });
+  }
+
+  it('matches unsplit output when fed one character at a time', () => {
+    const content = samples.map(([, , text]) => text).join('\n') + '\x1b[2;5H!\x1b';
+    const splits = Array.from({ length: content.length - 1 }, (_, i) => i + 1);
+    const [{ whole, streamed }] = probe([{ content, splits }]);
+    expect(streamed).toBe(whole);
+  });
+});